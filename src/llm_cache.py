@@ -0,0 +1,95 @@
+# src/llm_cache.py
+from __future__ import annotations
+
+import json
+import sqlite3
+from contextlib import closing
+from hashlib import blake2b
+from pathlib import Path
+from typing import Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, Generation
+
+
+class SQLiteLLMCache(BaseCache):
+    """
+    Disk-backed LangChain LLM response cache (stdlib sqlite3, no extra deps).
+
+    LangChain looks the cache up with the fully rendered prompt plus the model
+    settings, so re-running the demo over an unchanged inbox skips the LLM
+    round-trips, while any change to an email, prompt template or model misses.
+
+    Only generation text / message content is stored; the tools never read
+    tool calls or response metadata. Empty or cut-off replies (finish reason
+    other than a normal stop) are not stored, so a hit never replays them.
+    """
+
+    def __init__(self, database_path: Path) -> None:
+        self.database_path = Path(database_path)
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ?", (self._key(prompt, llm_string),)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return [
+                ChatGeneration(message=AIMessage(content=g["content"])) if g["chat"] else Generation(text=g["content"])
+                for g in json.loads(row[0])
+            ]
+        except Exception:
+            return None  # unreadable entry: treat as a miss
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        if not return_val or not all(map(_is_complete, return_val)):
+            return
+        value = json.dumps(
+            [
+                {"chat": True, "content": g.message.content}
+                if isinstance(g, ChatGeneration)
+                else {"chat": False, "content": g.text}
+                for g in return_val
+            ]
+        )
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value) VALUES (?, ?)",
+                (self._key(prompt, llm_string), value),
+            )
+
+    def clear(self, **kwargs) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM llm_cache")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call: safe from LangChain's executor threads
+        return sqlite3.connect(self.database_path, timeout=30)
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return blake2b(f"{llm_string}\x00{prompt}".encode("utf-8"), digest_size=32).hexdigest()
+
+
+# Normal end of generation: OpenAI reports "stop", Anthropic "end_turn"
+_STOP_REASONS = (None, "stop", "end_turn")
+
+
+def _is_complete(generation: Generation) -> bool:
+    info = generation.generation_info or {}
+    if isinstance(generation, ChatGeneration):
+        content = generation.message.content
+        meta = generation.message.response_metadata or {}
+        reason = info.get("finish_reason") or meta.get("finish_reason") or meta.get("stop_reason")
+    else:
+        content = generation.text
+        reason = info.get("finish_reason")
+    if isinstance(content, str):
+        content = content.strip()
+    return bool(content) and reason in _STOP_REASONS
@@ -5,22 +5,32 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import argparse
+import asyncio
+import atexit
 import json
 import os
-from datetime import datetime
+import sys
+import threading
+from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Iterable, List, Optional, Set, Tuple, Union
 
+try:
+    import orjson  # fast native JSON encoder; stdlib json is the fallback
+except ImportError:
+    orjson = None
+
+from langchain_core.globals import set_llm_cache
 from rich.console import Console
+from rich.markup import render as render_markup
 from rich.panel import Panel
 from rich.prompt import Prompt
 
-# LangChain LLMs (installed via requirements.txt)
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-
+from src.llm_cache import SQLiteLLMCache
 from src.orchestrator import WarrantyClaimsOrchestrator, OrchestratorConfig
-from src.schemas import ReviewPacket
+from src.schemas import EmailMessage, ReviewPacket
+from src.tools.triage_tool import TriageResult
 from src.tools import (
     InboxTool,
     InboxPaths,
@@ -43,6 +53,12 @@ console = Console()
 # -----------------------------
 # LLM Provider Adapter
 # -----------------------------
+# One connection pool per process, shared by every tool using the LLM
+HTTP_MAX_CONNECTIONS = 50
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+_shared_http_async_client = None
+
+
 def get_llm() -> Optional[object]:
     """
     Returns a LangChain chat model if an API key is present.
@@ -50,47 +66,139 @@ def get_llm() -> Optional[object]:
       1) OpenAI (OPENAI_API_KEY)
       2) Anthropic (ANTHROPIC_API_KEY)
     If none are present, returns None (tools fall back to heuristics/templates).
+
+    Provider packages are imported lazily so only the one in use is loaded.
     """
+    global _shared_http_async_client
+
     if os.getenv("OPENAI_API_KEY"):
+        import httpx
+        from langchain_openai import ChatOpenAI
+        from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
+
+        # Explicit pools sized for the concurrent fan-out (keeps the SDK's default timeouts)
+        limits = httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        )
+        http_client = DefaultHttpxClient(limits=limits)
+        atexit.register(http_client.close)
+        _shared_http_async_client = DefaultAsyncHttpxClient(limits=limits)
+
         # Keep temperature low for consistent extraction/triage
-        return ChatOpenAI(model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"), temperature=0)
-    if os.getenv("ANTHROPIC_API_KEY"):
-        return ChatAnthropic(model=os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-latest"), temperature=0)
-    return None
+        llm = ChatOpenAI(
+            model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+            temperature=0,
+            http_client=http_client,
+            http_async_client=_shared_http_async_client,
+        )
+    elif os.getenv("ANTHROPIC_API_KEY"):
+        from langchain_anthropic import ChatAnthropic
+
+        llm = ChatAnthropic(model=os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-latest"), temperature=0)
+    else:
+        return None
+
+    enable_llm_cache()
+    return llm
+
+
+async def aclose_shared_http_client() -> None:
+    """Close the shared async pool; must run on the event loop that used it."""
+    global _shared_http_async_client
+    if _shared_http_async_client is not None:
+        await _shared_http_async_client.aclose()
+        _shared_http_async_client = None
+
+
+def enable_llm_cache() -> None:
+    """
+    Opt-in: when LLM_CACHE_PATH is set, persist LLM responses across runs so
+    re-processing identical emails with identical prompts skips the API call.
+    The file holds replies built from customer emails; nothing expires it.
+    """
+    cache_path = os.getenv("LLM_CACHE_PATH")
+    if cache_path:
+        set_llm_cache(SQLiteLLMCache(Path(cache_path)))
 
 
 # -----------------------------
 # File helpers
 # -----------------------------
-def write_json(path: Path, data: dict) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
-
-
-def write_text(path: Path, text: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(text, encoding="utf-8")
+# Output dirs already created in this process (skip repeat mkdir syscalls)
+_dirs_created: set = set()
+
+
+def _ensure_parent(path: Path) -> None:
+    parent = path.parent
+    if parent not in _dirs_created:
+        parent.mkdir(parents=True, exist_ok=True)
+        _dirs_created.add(parent)
+
+
+def json_bytes(data: dict) -> bytes:
+    # Callers pass JSON-ready data (model_dump(mode="json"), pre-formatted timestamps)
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+def flush_outputs(outputs: List[Tuple[Path, bytes]]) -> None:
+    """Write buffered (path, contents) outputs in one pass, then clear the buffer."""
+    for path, data in outputs:
+        _ensure_parent(path)
+        path.write_bytes(data)
+    outputs.clear()
+
+
+_SUMMARY_TMPL = (
+    "[bold]Packet:[/bold] {packet_id}\n"
+    "[bold]Email ID:[/bold] {email_id}\n"
+    "[bold]Product:[/bold] {product}\n"
+    "[bold]Purchase Date:[/bold] {purchase_date}\n"
+    "[bold]Proof of Purchase:[/bold] {proof}\n"
+    "[bold]Shipping Address:[/bold] {address}\n"
+    "[bold]Issue:[/bold] {issue}\n"
+    "\n"
+    "[bold]Selected Policy:[/bold] {policy_name} ({policy_id})\n"
+    "[bold]Recommendation:[/bold] {recommendation}  |  [bold]Confidence:[/bold] {confidence}"
+    "{missing}"
+)
 
 
 def print_packet_summary(packet: ReviewPacket) -> None:
     claim = packet.extracted
-    lines = [
-        f"[bold]Packet:[/bold] {packet.packet_id}",
-        f"[bold]Email ID:[/bold] {packet.email_id}",
-        f"[bold]Product:[/bold] {claim.product_name or claim.product_model_hint or 'UNKNOWN'}",
-        f"[bold]Purchase Date:[/bold] {claim.purchase_date.isoformat() if claim.purchase_date else 'UNKNOWN'}",
-        f"[bold]Proof of Purchase:[/bold] {claim.proof_of_purchase_present}",
-        f"[bold]Shipping Address:[/bold] {'YES' if claim.shipping_address else 'NO'}",
-        f"[bold]Issue:[/bold] {claim.issue_description}",
-        "",
-        f"[bold]Selected Policy:[/bold] {packet.selected_policy_product_name} ({packet.selected_policy_id})",
-        f"[bold]Recommendation:[/bold] {packet.recommendation}  |  [bold]Confidence:[/bold] {packet.confidence}",
-    ]
-    if claim.missing_fields:
-        lines.append("")
-        lines.append(f"[bold red]Missing Fields:[/bold red] {', '.join(claim.missing_fields)}")
-
-    console.print(Panel("\n".join(lines), title="Human Review Packet (Summary)", expand=False))
+    text = _SUMMARY_TMPL.format(
+        packet_id=packet.packet_id,
+        email_id=packet.email_id,
+        product=claim.product_name or claim.product_model_hint or "UNKNOWN",
+        purchase_date=claim.purchase_date.isoformat() if claim.purchase_date else "UNKNOWN",
+        proof=claim.proof_of_purchase_present,
+        address="YES" if claim.shipping_address else "NO",
+        issue=claim.issue_description,
+        policy_name=packet.selected_policy_product_name,
+        policy_id=packet.selected_policy_id,
+        recommendation=packet.recommendation,
+        confidence=packet.confidence,
+        missing=(
+            f"\n\n[bold red]Missing Fields:[/bold red] {', '.join(claim.missing_fields)}"
+            if claim.missing_fields
+            else ""
+        ),
+    )
+    if not console.is_terminal:
+        # Redirected/batch output: skip rich's panel layout, print plain text
+        print("Human Review Packet (Summary)")
+        print(render_markup(text).plain)
+        return
+    console.print(Panel(text, title="Human Review Packet (Summary)", expand=False))
+
+
+def print_rule(title: str) -> None:
+    if not console.is_terminal:
+        print(f"--- {render_markup(title).plain} ---")
+        return
+    console.rule(title)
 
 
 # -----------------------------
@@ -113,10 +221,99 @@ def prompt_human_decision() -> str:
     return "MORE_INFO_REQUESTED"
 
 
+async def ask_human_decision() -> str:
+    """
+    Run the blocking terminal prompt off the event loop, so packets for later
+    emails keep building while the reviewer decides. A daemon thread is used
+    (not the default executor) so Ctrl-C at the prompt exits immediately.
+    """
+    loop = asyncio.get_running_loop()
+    fut: asyncio.Future = loop.create_future()
+
+    def _settle(setter, value) -> None:
+        if not fut.done():
+            setter(value)
+
+    def _ask() -> None:
+        try:
+            decision = prompt_human_decision()
+        except BaseException as e:
+            loop.call_soon_threadsafe(_settle, fut.set_exception, e)
+        else:
+            loop.call_soon_threadsafe(_settle, fut.set_result, decision)
+
+    threading.Thread(target=_ask, daemon=True).start()
+    return await fut
+
+
+# -----------------------------
+# Concurrent packet building
+# -----------------------------
+async def iter_review_packets(
+    orchestrator: WarrantyClaimsOrchestrator,
+    emails: Iterable[EmailMessage],
+    max_workers: int,
+) -> AsyncIterator[Tuple[EmailMessage, Union[ReviewPacket, None, BaseException]]]:
+    """
+    Build review packets concurrently and yield them in inbox order.
+
+    A background producer consumes emails as a stream: each chunk is triaged
+    in one batched LLM call and its packet tasks start right away. LLM
+    round-trips dominate wall time, so overlapping them is the main win; the
+    semaphore caps in-flight emails to stay within provider rate limits.
+    Each result is yielded as soon as it is ready, so the caller can show the
+    first packet while later ones are still in flight (e.g. during human
+    think time). Per-email failures are yielded, not raised. If the caller
+    stops early, packets still in flight are cancelled.
+    """
+    sem = asyncio.Semaphore(max(1, max_workers))
+    queue: asyncio.Queue = asyncio.Queue()
+    tasks: Set[asyncio.Task] = set()
+
+    async def _one(email: EmailMessage, triage_result: TriageResult) -> Optional[ReviewPacket]:
+        async with sem:
+            return await orchestrator.aprocess_email_to_review_packet(email, triage_result)
+
+    async def _produce() -> None:
+        try:
+            it = iter(emails)
+            while chunk := list(islice(it, orchestrator.triage.batch_size)):
+                # NON_CLAIMs skip further LLM work once triaged
+                triage_results = await orchestrator.triage.aclassify_batch(chunk)
+                for email, triage_result in zip(chunk, triage_results):
+                    task = asyncio.create_task(_one(email, triage_result))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    queue.put_nowait((email, task))
+        finally:
+            queue.put_nowait(None)
+
+    producer = asyncio.create_task(_produce())
+    try:
+        while (item := await queue.get()) is not None:
+            email, task = item
+            try:
+                result = await task
+            except Exception as e:
+                result = e
+            yield email, result
+        await producer  # surface inbox/triage errors
+    finally:
+        # Unread packets would otherwise keep calling the LLM and moving inbox files
+        pending = [t for t in (producer, *tasks) if not t.done()]
+        for t in pending:
+            t.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
 # -----------------------------
 # Main pipeline
 # -----------------------------
-def run_demo(project_root: Path) -> None:
+def run_demo(project_root: Path, max_workers: int = 4, trusted_inputs: bool = False) -> None:
+    asyncio.run(run_demo_async(project_root, max_workers, trusted_inputs))
+
+
+async def run_demo_async(project_root: Path, max_workers: int = 4, trusted_inputs: bool = False) -> None:
     data_dir = project_root / "data"
 
     inbox_dir = data_dir / "inbox"
@@ -143,7 +340,15 @@ def run_demo(project_root: Path) -> None:
         )
     )
 
-    policy_retriever = PolicyRetriever(PolicyRetrieverConfig(policies_dir=policies_dir))
+    # Opt-in: when POLICY_CACHE_PATH is set, parsed policies are reused across runs
+    policy_cache_path = os.getenv("POLICY_CACHE_PATH")
+    policy_retriever = PolicyRetriever(
+        PolicyRetrieverConfig(
+            policies_dir=policies_dir,
+            trusted=trusted_inputs,
+            cache_path=Path(policy_cache_path) if policy_cache_path else None,
+        )
+    )
     known_products = policy_retriever.list_products()
 
     triage_tool = TriageTool(llm=llm)
@@ -163,74 +368,88 @@ def run_demo(project_root: Path) -> None:
         config=OrchestratorConfig(auto_archive_processed=False),
     )
 
-    # Load emails
-    emails, errors = inbox_tool.load_all_emails()
+    # Stream inbox emails into the concurrent packet build; each packet is
+    # reviewed as soon as it is ready while later ones keep building
+    errors: List[Tuple[Path, str]] = []
+    # Packets, decisions and drafts are buffered and written together at the
+    # end of the run (also on early exit, via the finally below)
+    pending_writes: List[Tuple[Path, bytes]] = []
+    processed = 0
+    console.print("[bold]Processing inbox emails...[/bold]\n")
+
+    try:
+        async for email, packet in iter_review_packets(
+            orchestrator, inbox_tool.iter_emails(errors, trusted=trusted_inputs), max_workers
+        ):
+            processed += 1
+            print_rule(f"[bold]Processing {email.email_id}[/bold]")
+
+            if isinstance(packet, BaseException):
+                console.print(f"[red]Failed to build review packet:[/red] {packet}\n")
+                continue
+            if packet is None:
+                console.print("[cyan]Triage: NON_CLAIM → moved to data/triage_rejected/[/cyan]\n")
+                continue
+
+            # Write review packet to review_queue
+            packet_path = review_queue_dir / f"review_{packet.packet_id}.json"
+            pending_writes.append((packet_path, json_bytes(packet.model_dump(mode="json"))))
+            console.print(f"[green]Queued review packet:[/green] {packet_path}")
+
+            # Show summary + ask human decision
+            print_packet_summary(packet)
+            human_decision = await ask_human_decision()
+
+            # Save decision
+            decision_payload = {
+                "packet_id": packet.packet_id,
+                "email_id": packet.email_id,
+                "human_decision": human_decision,
+                "decided_at": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
+                "notes": "",
+            }
+            decision_path = decisions_dir / f"decision_{packet.packet_id}.json"
+            pending_writes.append((decision_path, json_bytes(decision_payload)))
+            console.print(f"[green]Queued decision:[/green] {decision_path}")
+
+            # Load selected policy for post-actions (the packet already names it)
+            policy = policy_retriever.get_policy_by_id(packet.selected_policy_id)
+
+            # Generate outputs to outbox (email draft + optional return label)
+            outputs = await orchestrator.adraft_outputs_after_human_decision(
+                packet=packet, policy=policy, human_decision=human_decision
+            )
+
+            drafted_email = outputs["drafted_email"]
+            label_ref = outputs.get("label_ref")
+
+            # Write email draft to outbox
+            email_out_path = outbox_dir / f"email_{packet.email_id}_{human_decision.lower()}.txt"
+            pending_writes.append((email_out_path, drafted_email.encode("utf-8")))
+            console.print(f"[green]Queued customer email draft:[/green] {email_out_path}")
+
+            if label_ref:
+                console.print(f"[green]Return label generated:[/green] {outbox_dir / label_ref}")
+
+            console.print()
+    finally:
+        try:
+            if pending_writes:
+                console.print(f"[green]Writing {len(pending_writes)} output files...[/green]")
+            flush_outputs(pending_writes)
+        finally:
+            await aclose_shared_http_client()
+
     if errors:
         console.print("[red]Some inbox files failed to load:[/red]")
         for fp, err in errors:
             console.print(f" - {fp.name}: {err}")
         console.print()
 
-    if not emails:
+    if not processed:
         console.print("[yellow]No emails found in data/inbox/[/yellow]")
         return
 
-    console.print(f"[bold]Found {len(emails)} inbox email(s). Processing...[/bold]\n")
-
-    # Process each email
-    for email in emails:
-        console.rule(f"[bold]Processing {email.email_id}[/bold]")
-
-        packet = orchestrator.process_email_to_review_packet(email)
-        if packet is None:
-            console.print("[cyan]Triage: NON_CLAIM → moved to data/triage_rejected/[/cyan]\n")
-            continue
-
-        # Write review packet to review_queue
-        packet_path = review_queue_dir / f"review_{packet.packet_id}.json"
-        write_json(packet_path, packet.model_dump())
-        console.print(f"[green]Created review packet:[/green] {packet_path}")
-
-        # Show summary + ask human decision
-        print_packet_summary(packet)
-        human_decision = prompt_human_decision()
-
-        # Save decision
-        decision_payload = {
-            "packet_id": packet.packet_id,
-            "email_id": packet.email_id,
-            "human_decision": human_decision,
-            "decided_at": datetime.utcnow().isoformat() + "Z",
-            "notes": "",
-        }
-        decision_path = decisions_dir / f"decision_{packet.packet_id}.json"
-        write_json(decision_path, decision_payload)
-        console.print(f"[green]Saved decision:[/green] {decision_path}")
-
-        # Load selected policy for post-actions
-        policy = policy_retriever.get_policy_by_product(packet.selected_policy_product_name)
-        if policy is None:
-            # Extremely unlikely, but keep demo safe
-            policy, _ = policy_retriever.select_policy(packet.extracted)
-
-        # Generate outputs to outbox (email draft + optional return label)
-        outputs = orchestrator.draft_outputs_after_human_decision(
-            packet=packet, policy=policy, human_decision=human_decision
-        )
-
-        drafted_email = outputs["drafted_email"]
-        label_ref = outputs.get("label_ref")
-
-        # Write email draft to outbox
-        email_out_path = outbox_dir / f"email_{packet.email_id}_{human_decision.lower()}.txt"
-        write_text(email_out_path, drafted_email)
-        console.print(f"[green]Wrote customer email draft:[/green] {email_out_path}")
-
-        if label_ref:
-            console.print(f"[green]Return label generated:[/green] {outbox_dir / label_ref}")
-
-        console.print()
-
     console.print("[bold green]Demo complete.[/bold green]")
     console.print(f"Review packets: {review_queue_dir}")
     console.print(f"Decisions:      {decisions_dir}")
@@ -238,19 +457,60 @@ def run_demo(project_root: Path) -> None:
     console.print(f"Triage rejects: {triage_rejected_dir}")
 
 
+def use_uvloop() -> None:
+    """Run asyncio on uvloop (libuv) when available; the stdlib loop otherwise."""
+    if sys.platform == "win32":
+        return
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
 def main() -> None:
+    global console
+
     parser = argparse.ArgumentParser(description="Agentic AI Warranty Claims Processor (CLI demo)")
     sub = parser.add_subparsers(dest="cmd", required=True)
 
     demo = sub.add_parser("demo", help="Process all inbox emails once (one-command demo)")
     demo.add_argument("--root", default=".", help="Project root (default: current directory)")
+    demo.add_argument(
+        "--max-workers",
+        type=int,
+        default=4,
+        help="Max emails processed concurrently (default: 4)",
+    )
+    demo.add_argument(
+        "--no-ui",
+        action="store_true",
+        help="Plain text output without panels/colors (auto when stdout is not a terminal)",
+    )
+    demo.add_argument(
+        "--trusted-inputs",
+        action="store_true",
+        help="Skip validation of inbox/policy JSON (model_construct); only for files already known to be valid",
+    )
 
     args = parser.parse_args()
 
+    use_uvloop()
+
+    if getattr(args, "no_ui", False):
+        console = Console(force_terminal=False, no_color=True)
+
     project_root = Path(args.root).resolve()
 
     if args.cmd == "demo":
-        run_demo(project_root)
+        try:
+            run_demo(project_root, max_workers=args.max_workers, trusted_inputs=args.trusted_inputs)
+        except KeyboardInterrupt:
+            console.print("\n[yellow]Interrupted.[/yellow]")
+            sys.stdout.flush()
+            # The prompt thread may still be blocked on stdin; skip interpreter
+            # finalization, which would otherwise wait on/abort over it
+            os._exit(130)
 
 
 if __name__ == "__main__":
@@ -1,8 +1,9 @@
 # src/orchestrator.py
 from __future__ import annotations
 
-import uuid
+import asyncio
 from dataclasses import dataclass
+from secrets import token_hex
 from typing import Optional, Dict
 
 from src.schemas import ReviewPacket
@@ -15,9 +16,10 @@ from src.tools import (
     EmailWriter,
     LabelGenerator,
 )
+from src.tools.triage_tool import TriageResult
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OrchestratorConfig:
     """
     Configuration for orchestration behavior.
@@ -60,15 +62,23 @@ class WarrantyClaimsOrchestrator:
     # -------------------------------------------------
     # Phase 1: From inbox email → review packet
     # -------------------------------------------------
-    def process_email_to_review_packet(self, email) -> Optional[ReviewPacket]:
+    def process_email_to_review_packet(
+        self,
+        email,
+        triage_result: Optional[TriageResult] = None,
+    ) -> Optional[ReviewPacket]:
         """
         Process a single email into a ReviewPacket.
 
+        triage_result may be passed in when triage already ran (e.g. batched);
+        otherwise the email is classified here.
+
         Returns:
           - ReviewPacket if classified as WARRANTY_CLAIM
           - None if classified as NON_CLAIM (file moved to triage_rejected)
         """
-        triage_result = self.triage.classify(email)
+        if triage_result is None:
+            triage_result = self.triage.classify(email)
 
         if triage_result.label == "NON_CLAIM":
             self.inbox.move_to_triage_rejected(email.email_id)
@@ -77,12 +87,51 @@ class WarrantyClaimsOrchestrator:
         # 1) Extraction
         claim = self.extraction.extract(email)
 
+        return self._build_packet(email, triage_result, claim)
+
+    async def aprocess_email_to_review_packet(
+        self,
+        email,
+        triage_result: Optional[TriageResult] = None,
+    ) -> Optional[ReviewPacket]:
+        """
+        Async variant of process_email_to_review_packet().
+
+        The LLM-backed steps (triage, extraction) are awaited so several emails
+        can be processed concurrently on one event loop. When triage still has
+        to run, extraction is started alongside it (they are independent) and
+        cancelled if the email turns out to be a NON_CLAIM.
+        """
+        extract_task: Optional[asyncio.Task] = None
+        if triage_result is None:
+            extract_task = asyncio.create_task(self.extraction.aextract(email))
+            try:
+                triage_result = await self.triage.aclassify(email)
+            except BaseException:
+                extract_task.cancel()
+                raise
+
+        if triage_result.label == "NON_CLAIM":
+            if extract_task is not None:
+                extract_task.cancel()
+            self.inbox.move_to_triage_rejected(email.email_id)
+            return None
+
+        # 1) Extraction
+        if extract_task is not None:
+            claim = await extract_task
+        else:
+            claim = await self.extraction.aextract(email)
+
+        return self._build_packet(email, triage_result, claim)
+
+    def _build_packet(self, email, triage_result, claim) -> ReviewPacket:
         # 2) Policy selection + retrieval
         policy, selection_reason = self.policy_retriever.select_policy(claim)
         excerpts = self.policy_retriever.retrieve_excerpts(policy, claim)
 
         # 3) Decision support packet
-        packet_id = f"pkt_{email.email_id}_{uuid.uuid4().hex[:8]}"
+        packet_id = f"pkt_{email.email_id}_{token_hex(4)}"
         packet = self.decision.build_review_packet(
             packet_id=packet_id,
             email_id=email.email_id,
@@ -124,6 +173,40 @@ class WarrantyClaimsOrchestrator:
               → generate return label
               → send approval email
         """
+        label_ref = self._apply_human_decision(packet, human_decision)
+        drafted_email = self.email_writer.draft(
+            packet=packet,
+            policy=policy,
+            return_label_ref=label_ref,
+        )
+        return {
+            "drafted_email": drafted_email,
+            "label_ref": label_ref,
+        }
+
+    async def adraft_outputs_after_human_decision(
+        self,
+        packet: ReviewPacket,
+        policy,
+        human_decision: str,
+    ) -> Dict[str, Optional[str]]:
+        """Async variant of draft_outputs_after_human_decision(); same rules."""
+        label_ref = self._apply_human_decision(packet, human_decision)
+        drafted_email = await self.email_writer.adraft(
+            packet=packet,
+            policy=policy,
+            return_label_ref=label_ref,
+        )
+        return {
+            "drafted_email": drafted_email,
+            "label_ref": label_ref,
+        }
+
+    def _apply_human_decision(self, packet: ReviewPacket, human_decision: str) -> Optional[str]:
+        """
+        Update the packet for the human decision and generate the return label
+        when applicable. Returns the label reference (or None).
+        """
         label_ref = None
 
         if packet.customer_followup_questions is None:
@@ -139,56 +222,23 @@ class WarrantyClaimsOrchestrator:
                 packet.customer_followup_questions = [
                     "Please provide your shipping/return address so we can generate the return label."
                 ]
-
-                drafted_email = self.email_writer.draft(
-                    packet=packet,
-                    policy=policy,
-                    return_label_ref=None,
-                )
-                return {
-                    "drafted_email": drafted_email,
-                    "label_ref": None,
-                }
-
-            # Address present → proceed fully
-            packet.recommendation = "APPROVE"
-            label_ref = self.label_generator.generate(packet.extracted, packet.email_id)
-
-            drafted_email = self.email_writer.draft(
-                packet=packet,
-                policy=policy,
-                return_label_ref=label_ref,
-            )
-            return {
-                "drafted_email": drafted_email,
-                "label_ref": label_ref,
-            }
+            else:
+                # Address present → proceed fully.
+                # The label is rendered locally (no LLM), so the email draft
+                # stays the only model call for this decision.
+                packet.recommendation = "APPROVE"
+                label_ref = self.label_generator.generate(packet.extracted, packet.email_id)
 
         # -------------------------
         # REJECTED
         # -------------------------
-        if human_decision == "REJECTED":
+        elif human_decision == "REJECTED":
             packet.recommendation = "REJECT"
-            drafted_email = self.email_writer.draft(
-                packet=packet,
-                policy=policy,
-                return_label_ref=None,
-            )
-            return {
-                "drafted_email": drafted_email,
-                "label_ref": None,
-            }
 
         # -------------------------
         # MORE INFO REQUESTED
         # -------------------------
-        packet.recommendation = "NEED_MORE_INFO"
-        drafted_email = self.email_writer.draft(
-            packet=packet,
-            policy=policy,
-            return_label_ref=None,
-        )
-        return {
-            "drafted_email": drafted_email,
-            "label_ref": None,
-        }
+        else:
+            packet.recommendation = "NEED_MORE_INFO"
+
+        return label_ref
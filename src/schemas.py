@@ -1,7 +1,8 @@
 # src/schemas.py
 from __future__ import annotations
 
-from datetime import date, datetime
+from datetime import date, datetime, timezone
+from functools import cached_property
 from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, EmailStr, ConfigDict
@@ -117,6 +118,11 @@ class PolicyExcerpt(BaseModel):
     excerpt: str = Field(..., description="Short excerpt text")
     policy_id: Optional[str] = None
 
+    @cached_property
+    def is_exclusion(self) -> bool:
+        """Exclusion clause? Derived from `section` once per excerpt (not serialized)."""
+        return self.section.lower().startswith("exclusion")
+
 
 class ReviewPacket(BaseModel):
     """
@@ -128,7 +134,7 @@ class ReviewPacket(BaseModel):
 
     packet_id: str = Field(..., description="Unique ID for the review packet")
     email_id: str = Field(..., description="Source email/claim id")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     # Extracted claim details
     extracted: ClaimExtract
@@ -1,14 +1,35 @@
 # src/tools/decision_tool.py
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
-from datetime import date, datetime
-from typing import List, Optional
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
 
 from src.schemas import ClaimExtract, PolicyDoc, PolicyExcerpt, ReviewPacket
 
+# Exclusion keywords, each set compiled into one case-insensitive alternation
+# so a category is checked in a single scan of the issue text
+_VOLTAGE_KW = ("voltage converter", "converter", "240v", "220v", "abroad", "international voltage")
+_TRAVEL_KW = ("travel", "flight", "airline", "suitcase", "luggage")
+_TRAVEL_DAMAGE_KW = ("crack", "cracked", "broken", "damage", "damaged")
+_ACCESSORY_KW = ("attachment", "nozzle", "diffuser")
+_ACCESSORY_FIT_KW = ("loose", "does not fit", "doesn't fit", "no longer fits", "fits securely")
 
-@dataclass(frozen=True)
+
+def _alternation(keywords: Tuple[str, ...]) -> re.Pattern[str]:
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+
+_VOLTAGE_RE = _alternation(_VOLTAGE_KW)
+_TRAVEL_RE = _alternation(_TRAVEL_KW)
+_TRAVEL_DAMAGE_RE = _alternation(_TRAVEL_DAMAGE_KW)
+_ACCESSORY_RE = _alternation(_ACCESSORY_KW)
+_ACCESSORY_FIT_RE = _alternation(_ACCESSORY_FIT_KW)
+_LAST_MONTH_RE = _alternation(("last month",))
+
+
+@dataclass(frozen=True, slots=True)
 class DecisionConfig:
     warranty_months: int = 3
 
@@ -48,52 +69,52 @@ class DecisionTool:
             "shipping_address": bool(claim.shipping_address),
         }
 
-        facts: List[str] = []
         assumptions: List[str] = []
         reasoning: List[str] = []
         uncertainty: List[str] = []
         followups: List[str] = []
 
-        issue_lower = (claim.issue_description or "").lower()
+        issue = claim.issue_description or ""
+        mentions_last_month = _LAST_MONTH_RE.search(issue) is not None
 
         # -----------------------------
         # Facts (claim summary)
         # -----------------------------
-        facts.append(f"Issue reported: {claim.issue_description}")
-        facts.append(f"Selected policy: {policy.product_name} ({policy.policy_id})")
-        facts.append(f"Policy selection reason: {policy_selection_reason}")
-
-        if claim.product_name:
-            facts.append(f"Extracted product: {claim.product_name}")
-        else:
-            facts.append("Product model not confidently identified from the email.")
-
-        if claim.purchase_date:
-            facts.append(f"Purchase date provided: {claim.purchase_date.isoformat()}")
-        else:
-            facts.append("Exact purchase date not provided in the email.")
-
-        facts.append(f"Proof of purchase present: {claim.proof_of_purchase_present}")
+        facts: List[str] = [
+            f"Issue reported: {claim.issue_description}",
+            f"Selected policy: {policy.product_name} ({policy.policy_id})",
+            f"Policy selection reason: {policy_selection_reason}",
+            (
+                f"Extracted product: {claim.product_name}"
+                if claim.product_name
+                else "Product model not confidently identified from the email."
+            ),
+            (
+                f"Purchase date provided: {claim.purchase_date.isoformat()}"
+                if claim.purchase_date
+                else "Exact purchase date not provided in the email."
+            ),
+            f"Proof of purchase present: {claim.proof_of_purchase_present}",
+        ]
 
         # -----------------------------
         # REQUIRED: Relevant policy sections / excerpts
         # -----------------------------
         if referenced_excerpts:
             facts.append("Relevant policy sections reviewed (referenced excerpts):")
-            for ex in referenced_excerpts:
-                facts.append(f"- [{ex.section}] {ex.excerpt}")
+            facts.extend(f"- [{ex.section}] {ex.excerpt}" for ex in referenced_excerpts)
 
         # -----------------------------
         # Warranty window check
         # -----------------------------
         in_window: Optional[bool] = None
         if claim.purchase_date:
-            days = (date.today() - claim.purchase_date).days
+            days = date.today().toordinal() - claim.purchase_date.toordinal()
             max_days = policy.warranty_period_months * 30
             in_window = days <= max_days
             reasoning.append(f"Warranty window check: {days} days since purchase (limit ~{max_days} days).")
         else:
-            if "last month" in issue_lower:
+            if mentions_last_month:
                 assumptions.append("Customer indicates purchase within the last month; likely within warranty window.")
             else:
                 assumptions.append("Purchase date missing; cannot confirm warranty window without follow-up.")
@@ -101,27 +122,25 @@ class DecisionTool:
         # -----------------------------
         # Exclusion detection (fast, deterministic)
         # -----------------------------
-        def hit(*keywords: str) -> bool:
-            return any(k in issue_lower for k in keywords)
-
+        # Rules in precedence order (accessory > travel > voltage); first match wins
         exclusion_reason: Optional[str] = None
 
-        # Claim 2 style: voltage converter / international voltage
-        if hit("voltage converter", "converter", "240v", "220v", "abroad", "international voltage"):
-            exclusion_reason = "Used with a voltage converter / non-standard voltage (excluded)."
+        # Claim 6 style: wear & tear / accessory fitment issues
+        if _ACCESSORY_RE.search(issue) and _ACCESSORY_FIT_RE.search(issue):
+            exclusion_reason = "Accessory wear/fitment issue (treated as wear & tear / accessory not covered)."
 
         # Claim 8 style: travel damage / airline handling
-        if hit("travel", "flight", "airline", "suitcase", "luggage") and hit("crack", "cracked", "broken", "damage", "damaged"):
+        elif _TRAVEL_RE.search(issue) and _TRAVEL_DAMAGE_RE.search(issue):
             exclusion_reason = "Travel / airline handling damage (excluded)."
 
-        # Claim 6 style: wear & tear / accessory fitment issues
-        if hit("attachment", "nozzle", "diffuser") and hit("loose", "does not fit", "doesn't fit", "no longer fits", "fits securely"):
-            exclusion_reason = "Accessory wear/fitment issue (treated as wear & tear / accessory not covered)."
+        # Claim 2 style: voltage converter / international voltage
+        elif _VOLTAGE_RE.search(issue):
+            exclusion_reason = "Used with a voltage converter / non-standard voltage (excluded)."
 
         # Try to cite a matching exclusion excerpt if we reject
         def find_policy_exclusion_excerpt() -> Optional[str]:
             for ex in referenced_excerpts:
-                if ex.section.lower().startswith("exclusion"):
+                if ex.is_exclusion:
                     return ex.excerpt
             return None
 
@@ -167,8 +186,10 @@ class DecisionTool:
                 recommendation = "APPROVE"
                 # confidence depends on proof-of-purchase
                 confidence = "high" if claim.proof_of_purchase_present else "medium"
-                reasoning.append("No applicable exclusions found in the referenced policy sections.")
-                reasoning.append("Claim is within the warranty window; approval is recommended.")
+                reasoning.extend((
+                    "No applicable exclusions found in the referenced policy sections.",
+                    "Claim is within the warranty window; approval is recommended.",
+                ))
 
             elif in_window is False:
                 recommendation = "REJECT"
@@ -177,11 +198,13 @@ class DecisionTool:
 
             else:
                 # Unknown window (no purchase_date)
-                if "last month" in issue_lower:
+                if mentions_last_month:
                     recommendation = "APPROVE"
                     confidence = "medium"
-                    reasoning.append("Customer indicates purchase was last month; likely within warranty window.")
-                    reasoning.append("Approval is recommended, but exact purchase date must be confirmed.")
+                    reasoning.extend((
+                        "Customer indicates purchase was last month; likely within warranty window.",
+                        "Approval is recommended, but exact purchase date must be confirmed.",
+                    ))
                 else:
                     recommendation = "NEED_MORE_INFO"
                     confidence = "low"
@@ -201,17 +224,12 @@ class DecisionTool:
             reasoning.append("Recommendation based on available claim details and referenced policy sections.")
 
         # De-duplicate followups (keep order)
-        seen = set()
-        followups_deduped = []
-        for q in followups:
-            if q not in seen:
-                seen.add(q)
-                followups_deduped.append(q)
+        followups_deduped = list(dict.fromkeys(followups))
 
         return ReviewPacket(
             packet_id=packet_id,
             email_id=email_id,
-            created_at=datetime.utcnow(),
+            created_at=datetime.now(timezone.utc),
             extracted=claim,
             selected_policy_id=policy.policy_id,
             selected_policy_product_name=policy.product_name,
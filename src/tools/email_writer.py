@@ -11,7 +11,39 @@ from langchain_core.prompts import ChatPromptTemplate
 from src.schemas import ClaimExtract, PolicyDoc, ReviewPacket
 
 
-@dataclass(frozen=True)
+# -----------------------------
+# Template fallback bodies (filled with str.format_map)
+# -----------------------------
+_APPROVE_TMPL = (
+    "Hi {name},\n\n"
+    "Thanks for reaching out. Based on the information provided, we can proceed with your warranty claim for {product}.\n\n"
+    "Next steps:\n"
+    "1) Please package the item securely.\n"
+    "2) Use the return shipping label below to send it back.\n"
+    "3) Once we receive and inspect the unit, we will ship a replacement.\n\n"
+    "{label_line}\n\n"
+    "If you have any questions, just reply to this email.\n\n"
+    "Best regards,\n{signature}"
+)
+
+_REJECT_TMPL = (
+    "Hi {name},\n\n"
+    "Thanks for contacting us about your {product}. After reviewing your claim, we’re unable to approve it under the warranty.\n\n"
+    "Reason: This issue falls under an exclusion/requirement in the policy (e.g., {reason}).\n\n"
+    "{escalation_line}\n\n"
+    "Best regards,\n{signature}"
+)
+
+_MORE_INFO_TMPL = (
+    "Hi {name},\n\n"
+    "Thanks for reaching out about your {product}. We can help, but we need a bit more information to continue processing your warranty claim:\n\n"
+    "{questions_text}\n\n"
+    "Once you reply with the above details, we’ll review and get back to you quickly.\n\n"
+    "Best regards,\n{signature}"
+)
+
+
+@dataclass(frozen=True, slots=True)
 class EmailWriterConfig:
     company_name: str = "AeroDry Support"
     support_email: str = "support@aerodry.example"
@@ -62,6 +94,7 @@ class EmailWriter:
                 ),
             ]
         )
+        self._chain = (self._prompt | self.llm | self._str_parser) if self.llm else None
 
     # -----------------------------
     # Public API
@@ -83,6 +116,22 @@ class EmailWriter:
 
         return self._draft_template(packet, policy, return_label_ref)
 
+    async def adraft(
+        self,
+        packet: ReviewPacket,
+        policy: PolicyDoc,
+        return_label_ref: Optional[str] = None,
+    ) -> str:
+        """Async variant of draft(); same template fallback."""
+        if self.llm:
+            try:
+                text = await self._chain.ainvoke(self._llm_inputs(packet, policy, return_label_ref))
+                return text.strip()
+            except Exception:
+                pass
+
+        return self._draft_template(packet, policy, return_label_ref)
+
     # -----------------------------
     # LLM draft
     # -----------------------------
@@ -92,29 +141,32 @@ class EmailWriter:
         policy: PolicyDoc,
         return_label_ref: Optional[str],
     ) -> str:
+        text = self._chain.invoke(self._llm_inputs(packet, policy, return_label_ref))
+        return text.strip()
+
+    def _llm_inputs(
+        self,
+        packet: ReviewPacket,
+        policy: PolicyDoc,
+        return_label_ref: Optional[str],
+    ) -> dict:
         policy_excerpts = "\n".join(
-            f"- [{e.section}] {e.excerpt}" for e in packet.referenced_policy_excerpts
+            [f"- [{e.section}] {e.excerpt}" for e in packet.referenced_policy_excerpts]
         ) or "None"
 
         claim = packet.extracted
-        chain = self._prompt | self.llm | self._str_parser
-
-        text = chain.invoke(
-            {
-                "company_name": self.config.company_name,
-                "decision": packet.recommendation,
-                "customer_name": claim.customer_name or "Customer",
-                "product": claim.product_name or claim.product_model_hint or "Unknown product",
-                "purchase_date": claim.purchase_date.isoformat() if claim.purchase_date else "Unknown",
-                "issue": claim.issue_description,
-                "policy_product": policy.product_name,
-                "policy_excerpts": policy_excerpts,
-                "missing_fields": ", ".join(claim.missing_fields) if claim.missing_fields else "None",
-                "label_ref": return_label_ref or "N/A",
-            }
-        )
-
-        return text.strip()
+        return {
+            "company_name": self.config.company_name,
+            "decision": packet.recommendation,
+            "customer_name": claim.customer_name or "Customer",
+            "product": claim.product_name or claim.product_model_hint or "Unknown product",
+            "purchase_date": claim.purchase_date.isoformat() if claim.purchase_date else "Unknown",
+            "issue": claim.issue_description,
+            "policy_product": policy.product_name,
+            "policy_excerpts": policy_excerpts,
+            "missing_fields": ", ".join(claim.missing_fields) if claim.missing_fields else "None",
+            "label_ref": return_label_ref or "N/A",
+        }
 
     # -----------------------------
     # Template fallback
@@ -136,7 +188,7 @@ class EmailWriter:
             # Attempt to find an exclusion excerpt to cite
             exclusion_line = None
             for e in packet.referenced_policy_excerpts:
-                if e.section.lower().startswith("exclusion"):
+                if e.is_exclusion:
                     exclusion_line = e.excerpt
                     break
             reason = exclusion_line or "the warranty policy terms"
@@ -160,33 +212,23 @@ class EmailWriter:
         label_line = (
             f"Return label: {label_ref}" if label_ref else "Return label: (will be provided upon confirmation)"
         )
-        return (
-            f"Hi {name},\n\n"
-            f"Thanks for reaching out. Based on the information provided, we can proceed with your warranty claim for {product}.\n\n"
-            "Next steps:\n"
-            "1) Please package the item securely.\n"
-            f"2) Use the return shipping label below to send it back.\n"
-            f"3) Once we receive and inspect the unit, we will ship a replacement.\n\n"
-            f"{label_line}\n\n"
-            "If you have any questions, just reply to this email.\n\n"
-            f"Best regards,\n{self.config.signature}"
+        return _APPROVE_TMPL.format_map(
+            {"name": name, "product": product, "label_line": label_line, "signature": self.config.signature}
         )
 
     def _reject_template(self, name: str, product: str, reason: str) -> str:
-        return (
-            f"Hi {name},\n\n"
-            f"Thanks for contacting us about your {product}. After reviewing your claim, we’re unable to approve it under the warranty.\n\n"
-            f"Reason: This issue falls under an exclusion/requirement in the policy (e.g., {reason}).\n\n"
-            f"{self.config.escalation_line}\n\n"
-            f"Best regards,\n{self.config.signature}"
+        return _REJECT_TMPL.format_map(
+            {
+                "name": name,
+                "product": product,
+                "reason": reason,
+                "escalation_line": self.config.escalation_line,
+                "signature": self.config.signature,
+            }
         )
 
     def _more_info_template(self, name: str, product: str, questions: list[str]) -> str:
         questions_text = "\n".join([f"- {q}" for q in questions])
-        return (
-            f"Hi {name},\n\n"
-            f"Thanks for reaching out about your {product}. We can help, but we need a bit more information to continue processing your warranty claim:\n\n"
-            f"{questions_text}\n\n"
-            "Once you reply with the above details, we’ll review and get back to you quickly.\n\n"
-            f"Best regards,\n{self.config.signature}"
+        return _MORE_INFO_TMPL.format_map(
+            {"name": name, "product": product, "questions_text": questions_text, "signature": self.config.signature}
         )
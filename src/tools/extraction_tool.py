@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import date, datetime
 from typing import List, Optional
 
@@ -10,10 +11,20 @@ from dateutil import parser as dateparser
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 
 from src.schemas import ClaimExtract, EmailMessage
 
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_ORDER_ID_RE = re.compile(r"(order\s*(id|#)\s*[:\-]?\s*)([A-Za-z0-9\-]+)", re.IGNORECASE)
+_DATE_RE = re.compile(
+    r"(\b\d{4}-\d{2}-\d{2}\b|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2},?\s+\d{4}\b)",
+    re.IGNORECASE,
+)
+# Attachment names that look like proof of purchase (keyword + document/image extension)
+_PROOF_KW_RE = re.compile(r"invoice|receipt|order", re.IGNORECASE)
+_PROOF_RE = re.compile(r"(?:invoice|receipt|order).*\.(?:pdf|png|jpe?g)\Z", re.IGNORECASE | re.DOTALL)
+
 
 # -----------------------------
 # LLM output schema (JSON)
@@ -40,7 +51,11 @@ class _LLMExtract(BaseModel):
     proof_of_purchase_present: bool = False
 
 
-@dataclass(frozen=True)
+# Built once; validating through the adapter skips the classmethod dispatch per email
+_LLM_EXTRACT_ADAPTER = TypeAdapter(_LLMExtract)
+
+
+@dataclass(frozen=True, slots=True)
 class ExtractionConfig:
     """
     Fast demo config: provide known product names to help normalization.
@@ -58,8 +73,28 @@ class ExtractionTool:
     def __init__(self, llm: Optional[BaseChatModel], config: ExtractionConfig) -> None:
         self.llm = llm
         self.config = config
+        # (name, lowercased, lowercased alphanumerics only) per known product
+        self._known_lower = [
+            (p, p.lower(), _NON_ALNUM.sub("", p.lower())) for p in config.known_products
+        ]
+        # Per-instance memo: claims in a batch tend to repeat the same product hint
+        self._normalize_product = lru_cache(maxsize=1024)(self._normalize_product_uncached)
+        # One case-insensitive alternation over all known products (longest first,
+        # so "X Pro" wins over "X" at the same position), mapped back to canonical names
+        self._product_by_lower = {p_lower: p for p, p_lower, _ in reversed(self._known_lower)}
+        self._product_re = (
+            re.compile(
+                "|".join(re.escape(p) for p in sorted(config.known_products, key=len, reverse=True)),
+                re.IGNORECASE,
+            )
+            if config.known_products
+            else None
+        )
 
         self.parser = JsonOutputParser(pydantic_object=_LLMExtract)
+        # Constant per tool instance; rendering the schema on every email is wasted work
+        self._format_instructions = self.parser.get_format_instructions()
+        self._known_products_str = ", ".join(config.known_products)
         self.prompt = ChatPromptTemplate.from_messages(
             [
                 (
@@ -80,6 +115,8 @@ class ExtractionTool:
                 ),
             ]
         )
+        # Built once; composing a RunnableSequence per call is pure overhead
+        self._chain = (self.prompt | self.llm | self.parser) if self.llm else None
 
     def extract(self, email: EmailMessage) -> ClaimExtract:
         """
@@ -91,17 +128,8 @@ class ExtractionTool:
 
         if self.llm:
             try:
-                chain = self.prompt | self.llm | self.parser
-                result = chain.invoke(
-                    {
-                        "subject": email.subject,
-                        "body": email.body,
-                        "attachments": email.attachments,
-                        "known_products": ", ".join(self.config.known_products),
-                        "format_instructions": self.parser.get_format_instructions(),
-                    }
-                )
-                llm_data = _LLMExtract.model_validate_json(result.content)
+                result = self._chain.invoke(self._llm_inputs(email))
+                llm_data = _LLM_EXTRACT_ADAPTER.validate_python(result)
             except Exception:
                 llm_data = None
 
@@ -111,6 +139,31 @@ class ExtractionTool:
         # Convert LLM extract -> ClaimExtract with post-processing
         return self._to_claim_extract(email, llm_data)
 
+    async def aextract(self, email: EmailMessage) -> ClaimExtract:
+        """Async variant of extract(); same fallback and post-processing."""
+        llm_data: Optional[_LLMExtract] = None
+
+        if self.llm:
+            try:
+                result = await self._chain.ainvoke(self._llm_inputs(email))
+                llm_data = _LLM_EXTRACT_ADAPTER.validate_python(result)
+            except Exception:
+                llm_data = None
+
+        if llm_data is None:
+            llm_data = self._heuristic_extract(email)
+
+        return self._to_claim_extract(email, llm_data)
+
+    def _llm_inputs(self, email: EmailMessage) -> dict:
+        return {
+            "subject": email.subject,
+            "body": email.body,
+            "attachments": email.attachments,
+            "known_products": self._known_products_str,
+            "format_instructions": self._format_instructions,
+        }
+
     # -----------------------------
     # Post-processing / validation
     # -----------------------------
@@ -121,11 +174,7 @@ class ExtractionTool:
             parsed_purchase_date = self._parse_date_safe(data.purchase_date)
 
         # Infer proof_of_purchase_present: either model said true OR attachments look like invoices
-        proof_from_attachments = any(
-            a.lower().endswith((".pdf", ".png", ".jpg", ".jpeg"))
-            and ("invoice" in a.lower() or "receipt" in a.lower() or "order" in a.lower())
-            for a in email.attachments
-        )
+        proof_from_attachments = any(_PROOF_RE.search(a) for a in email.attachments)
         proof_present = bool(data.proof_of_purchase_present or proof_from_attachments)
 
         # Normalize product name if possible
@@ -179,6 +228,12 @@ class ExtractionTool:
         )
 
     def _parse_date_safe(self, s: str) -> Optional[date]:
+        # Fast path for the YYYY-MM-DD[THH:MM...] form the LLM is asked to return
+        if s[10:11] in ("", "T", " "):
+            try:
+                return date.fromisoformat(s[:10])
+            except ValueError:
+                pass
         try:
             dt = dateparser.parse(s, fuzzy=True)
             if not dt:
@@ -187,7 +242,7 @@ class ExtractionTool:
         except Exception:
             return None
 
-    def _normalize_product(self, raw: str) -> str:
+    def _normalize_product_uncached(self, raw: str) -> str:
         """
         Normalize to the closest known product by simple substring matching.
         Fast + good enough for a demo.
@@ -197,15 +252,14 @@ class ExtractionTool:
         raw_l = raw.lower()
 
         # Exact/substring match
-        for p in self.config.known_products:
-            if p.lower() in raw_l or raw_l in p.lower():
+        for p, p_lower, _ in self._known_lower:
+            if p_lower in raw_l or raw_l in p_lower:
                 return p
 
         # Try to match by removing non-alphanumerics
-        raw_clean = re.sub(r"[^a-z0-9]+", "", raw_l)
+        raw_clean = _NON_ALNUM.sub("", raw_l)
         best = ""
-        for p in self.config.known_products:
-            p_clean = re.sub(r"[^a-z0-9]+", "", p.lower())
+        for p, _, p_clean in self._known_lower:
             if raw_clean and raw_clean in p_clean:
                 best = p
                 break
@@ -217,37 +271,28 @@ class ExtractionTool:
     def _heuristic_extract(self, email: EmailMessage) -> _LLMExtract:
         text = f"{email.subject}\n{email.body}"
 
-        # Product guess: match any known product string in the text
+        # Product guess: first known product mentioned in the text (single scan)
         product_guess = None
-        low = text.lower()
-        for p in self.config.known_products:
-            if p.lower() in low:
-                product_guess = p
-                break
+        m = self._product_re.search(text) if self._product_re else None
+        if m:
+            product_guess = self._product_by_lower.get(m.group(0).lower())
 
         # Order ID guess: common patterns like "Order ID", "Order#", etc.
         order_id = None
-        m = re.search(r"(order\s*(id|#)\s*[:\-]?\s*)([A-Za-z0-9\-]+)", text, re.IGNORECASE)
+        m = _ORDER_ID_RE.search(text)
         if m:
             order_id = m.group(3)
 
         # Purchase date guess: look for a date-like substring
         purchase_date_iso = None
-        date_match = re.search(
-            r"(\b\d{4}-\d{2}-\d{2}\b|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2},?\s+\d{4}\b)",
-            text,
-            re.IGNORECASE,
-        )
+        date_match = _DATE_RE.search(text)
         if date_match:
             d = self._parse_date_safe(date_match.group(1))
             if d:
                 purchase_date_iso = d.isoformat()
 
         # Proof of purchase from attachments
-        proof = any(
-            "invoice" in a.lower() or "receipt" in a.lower() or "order" in a.lower()
-            for a in email.attachments
-        )
+        proof = any(_PROOF_KW_RE.search(a) for a in email.attachments)
 
         # Issue: just use the body trimmed
         issue_desc = email.body.strip()
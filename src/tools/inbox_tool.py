@@ -1,18 +1,36 @@
 # src/tools/inbox_tool.py
 from __future__ import annotations
 
+import errno
 import json
+import mmap
+import os
 import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Generic, Iterator, List, Literal, Optional, Tuple, TypeVar
 
 from pydantic import ValidationError
 
 from src.schemas import EmailMessage
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
 
-@dataclass(frozen=True)
+# Files at least this large are parsed straight from a read-only memory map
+MMAP_MIN_BYTES = 64 * 1024
+# Per-InboxTool cap on cached emails (least recently used evicted)
+CACHE_MAX_ENTRIES = 1024
+
+_V = TypeVar("_V")
+
+
+@dataclass(frozen=True, slots=True)
 class InboxPaths:
     inbox_dir: Path
     triage_rejected_dir: Path
@@ -20,6 +38,38 @@ class InboxPaths:
     processed_dir: Optional[Path] = None  # optional if you want to archive processed emails
 
 
+class _StampedLRU(Generic[_V]):
+    """
+    Bounded path -> value cache. An entry is only returned for the
+    (mtime_ns, size) stamp it was stored with, so changed files miss.
+    Locked because load_all_emails() loads on a thread pool.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, Tuple[Tuple[int, int], _V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, stamp: Tuple[int, int]) -> Optional[_V]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] != stamp:
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, stamp: Tuple[int, int], value: _V) -> None:
+        with self._lock:
+            self._data[key] = (stamp, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
 class InboxTool:
     """
     File-based inbox adapter.
@@ -32,6 +82,8 @@ class InboxTool:
 
     def __init__(self, paths: InboxPaths) -> None:
         self.paths = paths
+        # Validated emails: repeat scans skip unchanged files
+        self._cache: _StampedLRU[EmailMessage] = _StampedLRU(CACHE_MAX_ENTRIES)
         self.paths.inbox_dir.mkdir(parents=True, exist_ok=True)
         self.paths.triage_rejected_dir.mkdir(parents=True, exist_ok=True)
         self.paths.review_queue_dir.mkdir(parents=True, exist_ok=True)
@@ -40,40 +92,102 @@ class InboxTool:
 
     def list_email_files(self) -> List[Path]:
         """Return all JSON files in inbox, sorted for deterministic runs."""
-        return sorted(self.paths.inbox_dir.glob("*.json"))
+        return list_json_files(self.paths.inbox_dir)
+
+    def load_email(self, file_path: Path, trusted: bool = False) -> EmailMessage:
+        """
+        Load a single inbox JSON file into EmailMessage.
+        trusted=True skips pydantic validation (model_construct); only use it
+        for files from a producer that already writes valid EmailMessage JSON.
+        Validated results are cached until the file's mtime or size changes;
+        callers always get their own (deep) copy, so mutating it never leaks
+        into later loads.
+        """
+        st = os.stat(file_path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._cache.get(str(file_path), stamp)
+        if cached is not None:
+            return cached.model_copy(deep=True)
+
+        if trusted:
+            return EmailMessage.model_construct(**self._raw_with_id(file_path))
+
+        email = self._validate_email(file_path)
+        self._cache.put(str(file_path), stamp, email)
+        return email.model_copy(deep=True)
+
+    def _validate_email(self, file_path: Path) -> EmailMessage:
+        data = file_path.read_bytes()
+        # Single pass (pydantic-core parses and validates together) when the
+        # file carries its own email_id; otherwise take the dict path below
+        if b'"email_id"' in data:
+            try:
+                return EmailMessage.model_validate_json(data)
+            except ValidationError:
+                pass  # re-validated below to report the error consistently
 
-    def load_email(self, file_path: Path) -> EmailMessage:
-        """Load a single inbox JSON file into EmailMessage."""
-        raw = json.loads(file_path.read_text(encoding="utf-8"))
-        # Allow simple fallback: if email_id is missing, derive from filename
-        raw.setdefault("email_id", file_path.stem)
         try:
-            return EmailMessage.model_validate(raw)
+            return EmailMessage.model_validate(self._raw_with_id(file_path))
         except ValidationError as e:
             raise ValueError(f"Invalid email JSON in {file_path.name}: {e}") from e
 
-    def load_all_emails(self) -> Tuple[List[EmailMessage], List[Tuple[Path, str]]]:
+    def _raw_with_id(self, file_path: Path) -> dict:
+        raw = _read_json(file_path)
+        # Allow simple fallback: if email_id is missing, derive from filename
+        raw.setdefault("email_id", file_path.stem)
+        return raw
+
+    def iter_emails(
+        self, errors: Optional[List[Tuple[Path, str]]] = None, trusted: bool = False
+    ) -> Iterator[EmailMessage]:
         """
-        Load all emails in inbox.
-        Returns: (valid_emails, errors)
-        errors = list of (file_path, error_string)
+        Lazily load inbox emails one file at a time, so processing can start
+        before the whole inbox is parsed.
+        Files that fail to load are skipped and, if given, appended to
+        `errors` as (file_path, error_string). See load_email() for `trusted`.
         """
-        emails: List[EmailMessage] = []
-        errors: List[Tuple[Path, str]] = []
         for fp in self.list_email_files():
             try:
-                emails.append(self.load_email(fp))
+                email = self.load_email(fp, trusted=trusted)
             except Exception as e:
-                errors.append((fp, str(e)))
+                if errors is not None:
+                    errors.append((fp, str(e)))
+                continue
+            yield email
+
+    def load_all_emails(
+        self, max_workers: Optional[int] = None
+    ) -> Tuple[List[EmailMessage], List[Tuple[Path, str]]]:
+        """
+        Load all emails in inbox, reading/parsing files on a thread pool.
+        Returns: (valid_emails, errors), both in inbox (sorted filename) order
+        errors = list of (file_path, error_string)
+        """
+        files = self.list_email_files()
+        workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(self._try_load_email, files))
+
+        emails: List[EmailMessage] = []
+        errors: List[Tuple[Path, str]] = []
+        for fp, (email, error) in zip(files, outcomes):
+            if error is not None:
+                errors.append((fp, error))
+            else:
+                emails.append(email)
         return emails, errors
 
+    def _try_load_email(self, file_path: Path) -> Tuple[Optional[EmailMessage], Optional[str]]:
+        try:
+            return self.load_email(file_path), None
+        except Exception as e:
+            return None, str(e)
+
     def move_to_triage_rejected(self, email_id: str) -> Path:
         """Move the inbox file to triage_rejected/ and return new path."""
         src = self.paths.inbox_dir / f"{email_id}.json"
         dst = self.paths.triage_rejected_dir / f"{email_id}.json"
-        if not src.exists():
-            raise FileNotFoundError(f"Cannot move; inbox file not found: {src}")
-        return Path(shutil.move(str(src), str(dst)))
+        return self._move(src, dst)
 
     def move_to_processed(self, email_id: str) -> Optional[Path]:
         """
@@ -84,13 +198,76 @@ class InboxTool:
             return None
         src = self.paths.inbox_dir / f"{email_id}.json"
         dst = self.paths.processed_dir / f"{email_id}.json"
-        if not src.exists():
-            raise FileNotFoundError(f"Cannot move; inbox file not found: {src}")
-        return Path(shutil.move(str(src), str(dst)))
+        return self._move(src, dst)
+
+    def move_many(self, email_ids: List[str], to: Literal["processed", "rejected"]) -> List[Path]:
+        """
+        Move several inbox files to processed/ or triage_rejected/ in one go.
+        The inbox is listed once; if any id has no inbox file, nothing is moved
+        and FileNotFoundError is raised. Moving to processed/ is a no-op (empty
+        list) when processed_dir is None. Duplicate ids are moved once; returns
+        the new paths in first-seen order. Any other `to` raises ValueError.
+        """
+        if to == "processed":
+            target_dir = self.paths.processed_dir
+        elif to == "rejected":
+            target_dir = self.paths.triage_rejected_dir
+        else:
+            raise ValueError(f"Unknown move target {to!r}; expected 'processed' or 'rejected'")
+        if target_dir is None:
+            return []
+
+        with os.scandir(self.paths.inbox_dir) as it:
+            present = {entry.name for entry in it}
+        names = [f"{email_id}.json" for email_id in dict.fromkeys(email_ids)]
+        missing = [n for n in names if n not in present]
+        if missing:
+            raise FileNotFoundError(f"Cannot move; inbox files not found: {', '.join(missing)}")
+
+        return [self._move(self.paths.inbox_dir / n, target_dir / n) for n in names]
+
+    def _move(self, src: Path, dst: Path) -> Path:
+        # Same filesystem (the usual case): one atomic rename, no pre-stat
+        try:
+            os.replace(src, dst)
+        except FileNotFoundError:
+            if not src.exists():
+                raise FileNotFoundError(f"Cannot move; inbox file not found: {src}") from None
+            raise
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(str(src), str(dst))  # cross-device: copy + unlink
+        self._cache.pop(str(src))
+        return dst
 
     def peek_raw(self, email_id: str) -> dict:
         """Read raw JSON dict without validation (useful for debugging)."""
         fp = self.paths.inbox_dir / f"{email_id}.json"
         if not fp.exists():
             raise FileNotFoundError(fp)
-        return json.loads(fp.read_text(encoding="utf-8"))
+        return _read_json(fp)
+
+
+def list_json_files(directory: Path) -> List[Path]:
+    """Sorted *.json regular files directly inside `directory`."""
+    # scandir entries carry the file type from the directory read, so no
+    # per-file stat is needed to filter out subdirectories
+    with os.scandir(directory) as it:
+        return sorted(
+            Path(entry.path)
+            for entry in it
+            if entry.name.endswith(".json") and entry.is_file(follow_symlinks=False)
+        )
+
+
+def _read_json(file_path: Path):
+    """Parse a JSON file from its raw bytes, memory-mapping large files for orjson."""
+    with open(file_path, "rb") as f:
+        if orjson is None:
+            return json.loads(f.read())
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_MIN_BYTES:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as buf:
+            return orjson.loads(buf)
@@ -1,16 +1,32 @@
 # src/tools/label_generator.py
 from __future__ import annotations
 
-import uuid
+import os
+import secrets
+import time
 from dataclasses import dataclass
-from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 from src.schemas import ClaimExtract
 
+_LABEL_TEMPLATE = (
+    "=== RETURN SHIPPING LABEL (MOCK) ===\n"
+    "Created: {created}\n"
+    "Carrier: {carrier}\n"
+    "Service: {service}\n"
+    "Tracking: {tracking}\n\n"
+    "FROM:\n"
+    "{from_address}\n\n"
+    "TO:\n"
+    "{to_address}\n\n"
+    "Item: {item}\n"
+    "RMA: MOCK-RMA-0001\n"
+    "Instructions: Print this label and attach to your package.\n"
+)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class LabelGeneratorConfig:
     outbox_dir: Path
     carrier_name: str = "MockShip"
@@ -33,30 +49,36 @@ class LabelGenerator:
         """
         Returns a label reference string (filename) that you can include in the approval email.
         """
-        label_id = uuid.uuid4().hex[:10]
+        label_id = secrets.token_hex(5)
         filename = f"return_label_{email_id}_{label_id}.txt"
         path = self.config.outbox_dir / filename
 
-        to_address = claim.shipping_address or "CUSTOMER_ADDRESS_MISSING"
-
-        contents = (
-            "=== RETURN SHIPPING LABEL (MOCK) ===\n"
-            f"Created: {datetime.utcnow().isoformat()}Z\n"
-            f"Carrier: {self.config.carrier_name}\n"
-            f"Service: {self.config.service_level}\n"
-            f"Tracking: {self._mock_tracking_number(label_id)}\n\n"
-            "FROM:\n"
-            f"{self.config.from_address}\n\n"
-            "TO:\n"
-            f"{to_address}\n\n"
-            f"Item: {claim.product_name or claim.product_model_hint or 'Hair Dryer'}\n"
-            "RMA: MOCK-RMA-0001\n"
-            "Instructions: Print this label and attach to your package.\n"
+        contents = _LABEL_TEMPLATE.format_map(
+            {
+                "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "carrier": self.config.carrier_name,
+                "service": self.config.service_level,
+                "tracking": self._mock_tracking_number(label_id),
+                "from_address": self.config.from_address,
+                "to_address": claim.shipping_address or "CUSTOMER_ADDRESS_MISSING",
+                "item": claim.product_name or claim.product_model_hint or "Hair Dryer",
+            }
         )
 
-        path.write_text(contents, encoding="utf-8")
+        _write_bytes(path, contents.encode("utf-8"))
         return filename
 
     def _mock_tracking_number(self, seed: str) -> str:
         # Simple deterministic-looking tracking number
         return f"MS{seed.upper()}US"
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    """Write `data` to `path` with raw fd writes (no buffered/text IO layers)."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
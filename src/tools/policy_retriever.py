@@ -2,19 +2,53 @@
 from __future__ import annotations
 
 import json
+import os
 import re
+import string
 from dataclasses import dataclass
+from functools import lru_cache
+from hashlib import blake2b
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from pydantic import ValidationError
 
 from src.schemas import ClaimExtract, PolicyDoc, PolicyExcerpt
+from src.tools.inbox_tool import list_json_files
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
 
-@dataclass(frozen=True)
+# Tokenizer: everything except [a-z0-9] and whitespace becomes a separator.
+# ASCII text goes through str.translate; other text keeps the regex.
+_NON_TOKEN_RE = re.compile(r"[^a-z0-9\s]+")
+_ASCII_TOKEN_TABLE = str.maketrans(
+    {
+        c: " "
+        for c in map(chr, range(128))
+        if not (c in string.ascii_lowercase or c in string.digits or c.isspace())
+    }
+)
+
+# Bump whenever the layout of the optional policy cache file changes
+_POLICY_CACHE_VERSION = 2
+
+
+@lru_cache(maxsize=1)
+def _policy_schema_digest() -> str:
+    return blake2b(repr(sorted(PolicyDoc.model_fields.items())).encode(), digest_size=16).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
 class PolicyRetrieverConfig:
     policies_dir: Path
+    # Skip pydantic validation when loading (model_construct); for vetted policy files only
+    trusted: bool = False
+    # Optional JSON cache of parsed policies + clause tokens, reused while the
+    # policy files are unchanged; off by default, must live outside policies_dir
+    cache_path: Optional[Path] = None
 
 
 class PolicyRetriever:
@@ -29,7 +63,19 @@ class PolicyRetriever:
     def __init__(self, config: PolicyRetrieverConfig) -> None:
         self.config = config
         self.config.policies_dir.mkdir(parents=True, exist_ok=True)
+        if config.cache_path is not None and (
+            config.cache_path.resolve().is_relative_to(config.policies_dir.resolve())
+        ):
+            raise ValueError(f"cache_path must be outside policies_dir: {config.cache_path}")
         self._policies: List[PolicyDoc] = []
+        self._by_product: Dict[str, PolicyDoc] = {}
+        self._by_id: Dict[str, PolicyDoc] = {}
+        # (policy, lowercased product name, product name tokens), built at load
+        self._name_index: List[Tuple[PolicyDoc, str, set]] = []
+        # policy_id -> (policy, covered_issues tokens, exclusions tokens), built at load
+        self._clause_tokens: Dict[str, Tuple[PolicyDoc, List[set], List[set]]] = {}
+        # Per-instance memo of product-field matching (claims aren't hashable)
+        self._match_product_fields = lru_cache(maxsize=128)(self._match_product_fields_uncached)
         self._load_policies()
 
     # -----------------------------
@@ -39,10 +85,10 @@ class PolicyRetriever:
         return [p.product_name for p in self._policies]
 
     def get_policy_by_product(self, product_name: str) -> Optional[PolicyDoc]:
-        for p in self._policies:
-            if p.product_name.strip().lower() == product_name.strip().lower():
-                return p
-        return None
+        return self._by_product.get(product_name.strip().lower())
+
+    def get_policy_by_id(self, policy_id: str) -> Optional[PolicyDoc]:
+        return self._by_id.get(policy_id)
 
     def select_policy(self, claim: ClaimExtract) -> Tuple[PolicyDoc, str]:
         """
@@ -55,18 +101,10 @@ class PolicyRetriever:
         if not self._policies:
             raise RuntimeError(f"No policies loaded from {self.config.policies_dir}")
 
-        # 1) Exact match
-        if claim.product_name:
-            exact = self.get_policy_by_product(claim.product_name)
-            if exact:
-                return exact, f"Exact match on product_name='{claim.product_name}'."
-
-        # 2) Try product_model_hint
-        hint = (claim.product_model_hint or "").strip()
-        if hint:
-            match = self._best_match_from_text(hint)
-            if match:
-                return match, f"Matched policy using product_model_hint='{hint}'."
+        # 1) + 2) depend only on the product fields, so they are memoized
+        matched = self._match_product_fields(claim.product_name, claim.product_model_hint)
+        if matched:
+            return matched
 
         # 3) Fallback: best match using issue text + product tokens (if any)
         combined = " ".join(
@@ -84,7 +122,8 @@ class PolicyRetriever:
         Lightweight retrieval: return the most relevant policy sections.
         This is deliberately simple for a 48h exercise but still provides grounded references.
         """
-        issue = (claim.issue_description or "").lower()
+        issue_tokens = self._tokenize(claim.issue_description or "")
+        covered_tokens, exclusion_tokens = self._policy_clause_tokens(policy)
 
         excerpts: List[PolicyExcerpt] = []
 
@@ -98,14 +137,14 @@ class PolicyRetriever:
         )
 
         # Covered issues: include all, but prioritize those matching issue tokens
-        covered_sorted = self._rank_clauses(policy.covered_issues, issue)
+        covered_sorted = self._rank_clauses(policy.covered_issues, covered_tokens, issue_tokens)
         for c in covered_sorted[:3]:
             excerpts.append(
                 PolicyExcerpt(section="Covered Issues", excerpt=c, policy_id=policy.policy_id)
             )
 
         # Exclusions: include top matches; always include at least 1-2 exclusions for reviewer context
-        exclusions_sorted = self._rank_clauses(policy.exclusions, issue)
+        exclusions_sorted = self._rank_clauses(policy.exclusions, exclusion_tokens, issue_tokens)
         for e in (exclusions_sorted[:3] if exclusions_sorted else policy.exclusions[:2]):
             excerpts.append(
                 PolicyExcerpt(section="Exclusions", excerpt=e, policy_id=policy.policy_id)
@@ -122,15 +161,55 @@ class PolicyRetriever:
     # -----------------------------
     # Internal: load + matching
     # -----------------------------
+    def _match_product_fields_uncached(
+        self, product_name: Optional[str], product_model_hint: Optional[str]
+    ) -> Optional[Tuple[PolicyDoc, str]]:
+        # 1) Exact match
+        if product_name:
+            exact = self.get_policy_by_product(product_name)
+            if exact:
+                return exact, f"Exact match on product_name='{product_name}'."
+
+        # 2) Try product_model_hint
+        hint = (product_model_hint or "").strip()
+        if hint:
+            match = self._best_match_from_text(hint)
+            if match:
+                return match, f"Matched policy using product_model_hint='{hint}'."
+
+        return None
+
     def _load_policies(self) -> None:
         self._policies.clear()
-        for fp in sorted(self.config.policies_dir.glob("*.json")):
-            raw = json.loads(fp.read_text(encoding="utf-8"))
+        self._match_product_fields.cache_clear()
+        files = list_json_files(self.config.policies_dir)
+        fingerprint = self._fingerprint(files) if self.config.cache_path is not None else None
+        if fingerprint is not None and self._read_cache(fingerprint):
+            return
+
+        for fp in files:
+            data = fp.read_bytes()
+            if not self.config.trusted and b'"policy_id"' in data:
+                # Single pass: pydantic-core parses and validates together
+                try:
+                    policy = PolicyDoc.model_validate_json(data)
+                except ValidationError:
+                    pass  # re-validated below to report the error consistently
+                else:
+                    if "source_path" not in policy.model_fields_set:
+                        policy.source_path = str(fp)
+                    self._policies.append(policy)
+                    continue
+
+            raw = orjson.loads(data) if orjson is not None else json.loads(data)
 
             # Ensure policy_id exists (derive from filename if missing)
             raw.setdefault("policy_id", fp.stem)
             raw.setdefault("source_path", str(fp))
 
+            if self.config.trusted:
+                self._policies.append(PolicyDoc.model_construct(**raw))
+                continue
             try:
                 policy = PolicyDoc.model_validate(raw)
                 self._policies.append(policy)
@@ -143,6 +222,84 @@ class PolicyRetriever:
                 "Add 10 policy files like policy_aerodry_pro_1800.json"
             )
 
+        self._build_indexes()
+        if fingerprint is not None:
+            self._write_cache(fingerprint)
+
+    def _build_indexes(self, clause_tokens: Optional[List[Tuple[List[set], List[set]]]] = None) -> None:
+        # In-memory indexes for O(1) lookups; first file wins on duplicate names
+        self._by_product = {}
+        for p in self._policies:
+            self._by_product.setdefault(p.product_name.strip().lower(), p)
+        self._by_id = {p.policy_id: p for p in self._policies}
+        self._name_index = [
+            (p, p.product_name.lower(), self._tokenize(p.product_name)) for p in self._policies
+        ]
+        if clause_tokens is None:
+            clause_tokens = [
+                ([self._tokenize(c) for c in p.covered_issues], [self._tokenize(c) for c in p.exclusions])
+                for p in self._policies
+            ]
+        self._clause_tokens = {
+            p.policy_id: (p, covered, excluded) for p, (covered, excluded) in zip(self._policies, clause_tokens)
+        }
+
+    def _fingerprint(self, files: List[Path]) -> list:
+        # JSON-shaped so it compares equal after a round trip through the cache file.
+        # The resolved directory catches copied trees (source_path would be stale);
+        # the schema digest catches PolicyDoc changes without a manual version bump.
+        stats = []
+        for fp in files:
+            st = fp.stat()
+            stats.append([fp.name, st.st_mtime_ns, st.st_size])
+        return [
+            _POLICY_CACHE_VERSION,
+            self.config.trusted,
+            str(self.config.policies_dir.resolve()),
+            _policy_schema_digest(),
+            stats,
+        ]
+
+    def _read_cache(self, fingerprint: list) -> bool:
+        try:
+            data = self.config.cache_path.read_bytes()
+            cached = orjson.loads(data) if orjson is not None else json.loads(data)
+            if cached["fingerprint"] != fingerprint or not cached["policies"]:
+                return False
+            # Plain data only; validated like the policy files unless trusted
+            if self.config.trusted:
+                policies = [PolicyDoc.model_construct(**raw) for raw in cached["policies"]]
+            else:
+                policies = [PolicyDoc.model_validate(raw) for raw in cached["policies"]]
+            clause_tokens = [
+                ([set(t) for t in covered], [set(t) for t in excluded])
+                for covered, excluded in cached["clause_tokens"]
+            ]
+        except Exception:
+            return False  # missing, stale or unreadable: rebuild from the policy files
+
+        self._policies[:] = policies
+        self._build_indexes(clause_tokens)
+        return True
+
+    def _write_cache(self, fingerprint: list) -> None:
+        payload = {
+            "fingerprint": fingerprint,
+            "policies": [p.model_dump(mode="json") for p in self._policies],
+            "clause_tokens": [
+                ([sorted(t) for t in covered], [sorted(t) for t in excluded])
+                for covered, excluded in map(self._policy_clause_tokens, self._policies)
+            ],
+        }
+        path = self.config.cache_path
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode("utf-8"))
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)  # unwritable location: run without the cache
+
     def _best_match_from_text(self, text: str) -> Optional[PolicyDoc]:
         if not text:
             return None
@@ -150,15 +307,15 @@ class PolicyRetriever:
         if not text_tokens:
             return None
 
+        text_lower = text.lower()
         best: Optional[PolicyDoc] = None
         best_score = 0
 
-        for p in self._policies:
-            p_tokens = self._tokenize(p.product_name)
+        for p, name_lower, p_tokens in self._name_index:
             score = len(text_tokens.intersection(p_tokens))
 
             # Small boost if whole product name appears as substring
-            if p.product_name.lower() in text.lower():
+            if name_lower in text_lower:
                 score += 3
 
             if score > best_score:
@@ -167,14 +324,22 @@ class PolicyRetriever:
 
         return best if best_score > 0 else None
 
-    def _rank_clauses(self, clauses: List[str], issue_text_lower: str) -> List[str]:
+    def _policy_clause_tokens(self, policy: PolicyDoc) -> Tuple[List[set], List[set]]:
+        cached = self._clause_tokens.get(policy.policy_id)
+        if cached is not None and cached[0] is policy:
+            return cached[1], cached[2]
+        # Policy not loaded by this retriever: tokenize on the fly
+        return (
+            [self._tokenize(c) for c in policy.covered_issues],
+            [self._tokenize(c) for c in policy.exclusions],
+        )
+
+    def _rank_clauses(self, clauses: List[str], clause_tokens: List[set], issue_tokens: set) -> List[str]:
         """
         Rank policy clauses by overlap with issue text keywords.
         """
-        issue_tokens = self._tokenize(issue_text_lower)
         scored: List[Tuple[int, str]] = []
-        for c in clauses:
-            c_tokens = self._tokenize(c)
+        for c, c_tokens in zip(clauses, clause_tokens):
             overlap = len(issue_tokens.intersection(c_tokens))
             scored.append((overlap, c))
         scored.sort(key=lambda x: x[0], reverse=True)
@@ -182,6 +347,6 @@ class PolicyRetriever:
 
     def _tokenize(self, s: str) -> set:
         s = s.lower()
-        s = re.sub(r"[^a-z0-9\s]+", " ", s)
+        s = s.translate(_ASCII_TOKEN_TABLE) if s.isascii() else _NON_TOKEN_RE.sub(" ", s)
         toks = {t for t in s.split() if len(t) >= 3}
         return toks
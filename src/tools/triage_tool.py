@@ -1,7 +1,10 @@
 # src/tools/triage_tool.py
 from __future__ import annotations
 
-from typing import Literal, Optional
+import json
+import re
+from itertools import islice
+from typing import List, Literal, Optional
 
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
@@ -12,6 +15,32 @@ from src.schemas import EmailMessage
 
 TriageLabel = Literal["WARRANTY_CLAIM", "NON_CLAIM"]
 
+# Heuristic signals (matched against lowercased subject + body)
+# Strong spam signals
+_SPAM_SIGNALS = ("seo", "marketing", "partnership", "promotion", "ads", "advertising", "agency")
+# Broad claim signals (include wear/tear, travel damage, cracks, attachments)
+_CLAIM_SIGNALS = (
+    "warranty", "claim", "replace", "replacement", "refund", "return",
+    "bought", "purchase", "purchased", "order", "invoice", "receipt",
+    "dryer", "hair dryer", "aerodry",
+    "stopped", "not working", "won’t", "won't", "doesn't", "no power",
+    "overheat", "overheating", "shuts off", "burning", "sparks",
+    "touch", "controls", "firmware",
+    "attachment", "nozzle", "diffuser", "doesn't fit", "fits securely",
+    "cracked", "broken", "dropped",
+    "travel", "flight", "suitcase",
+)
+# Each set compiled into one alternation: a single scan finds any signal
+_SPAM_RE = re.compile("|".join(map(re.escape, _SPAM_SIGNALS)))
+_CLAIM_RE = re.compile("|".join(map(re.escape, _CLAIM_SIGNALS)))
+
+# Short-circuit signals: whole words only, so "ads" doesn't fire inside "heads".
+# Claim side is limited to unambiguous tokens; "bought"/"purchased" also show
+# up in sales outreach, so those emails still go to the LLM
+_STRONG_CLAIM_SIGNALS = ("warranty", "invoice", "receipt")
+_STRONG_SPAM_RE = re.compile(r"\b(?:%s)\b" % "|".join(map(re.escape, _SPAM_SIGNALS)))
+_STRONG_CLAIM_RE = re.compile(r"\b(?:%s)\b" % "|".join(map(re.escape, _STRONG_CLAIM_SIGNALS)))
+
 
 class TriageResult(BaseModel):
     label: TriageLabel = Field(..., description="WARRANTY_CLAIM or NON_CLAIM")
@@ -20,13 +49,28 @@ class TriageResult(BaseModel):
 
 class TriageTool:
     """
-    LLM-first triage. If LLM fails, a broad heuristic is used.
+    LLM triage with a heuristic fast path: emails with unambiguous signals are
+    labeled without calling the LLM; the rest go to the LLM, and if it fails a
+    broad heuristic is used.
     Heuristic goal: minimize false NON_CLAIM (better to over-route to claims).
     """
 
+    # Skip the LLM when the heuristic is confident (see _short_circuit);
+    # without an LLM the broad heuristic alone decides, as before
+    short_circuit: bool = True
+
+    # Emails per batched LLM call (keeps the prompt well under context limits)
+    batch_size: int = 20
+    # Body characters sent per email in batched calls
+    batch_body_chars: int = 1000
+    # Concurrent per-email LLM requests when a batched reply is unusable
+    batch_max_concurrency: int = 8
+
     def __init__(self, llm: Optional[BaseChatModel]) -> None:
         self.llm = llm
         self.parser = JsonOutputParser(pydantic_object=TriageResult)
+        self._format_instructions = self.parser.get_format_instructions()
+        self.batch_parser = JsonOutputParser()
 
         self.prompt = ChatPromptTemplate.from_messages(
             [
@@ -44,17 +88,31 @@ class TriageTool:
             ]
         )
 
+        self.batch_prompt = ChatPromptTemplate.from_messages(
+            [
+                (
+                    "system",
+                    "You classify emails for a warranty claims system.\n"
+                    "If the email is about a product problem, purchase, return, damage, or warranty, label WARRANTY_CLAIM.\n"
+                    "If it's marketing/spam/partnership/sales outreach, label NON_CLAIM.\n"
+                    "You receive a JSON array of emails. Return ONLY a JSON array with one object per email:\n"
+                    '[{{"email_id": "...", "label": "WARRANTY_CLAIM" or "NON_CLAIM", "reason": "short reason"}}]'
+                ),
+                ("human", "{emails}"),
+            ]
+        )
+
+        # Chains are built once and reused for every call
+        self._chain = (self.prompt | self.llm | self.parser) if self.llm else None
+        self._batch_chain = (self.batch_prompt | self.llm | self.batch_parser) if self.llm else None
+
     def classify(self, email: EmailMessage) -> TriageResult:
+        if (pre := self._short_circuit(email)) is not None:
+            return pre
+
         if self.llm:
             try:
-                chain = self.prompt | self.llm | self.parser
-                out = chain.invoke(
-                    {
-                        "subject": email.subject,
-                        "body": email.body,
-                        "format_instructions": self.parser.get_format_instructions(),
-                    }
-                )
+                out = self._chain.invoke(self._llm_inputs(email))
                 # normalize dict -> model if needed
                 return TriageResult.model_validate(out)
             except Exception:
@@ -62,28 +120,127 @@ class TriageTool:
 
         return self._heuristic(email)
 
-    def _heuristic(self, email: EmailMessage) -> TriageResult:
+    async def aclassify(self, email: EmailMessage) -> TriageResult:
+        """Async variant of classify(); same fallback behavior."""
+        if (pre := self._short_circuit(email)) is not None:
+            return pre
+
+        if self.llm:
+            try:
+                out = await self._chain.ainvoke(self._llm_inputs(email))
+                return TriageResult.model_validate(out)
+            except Exception:
+                pass
+
+        return self._heuristic(email)
+
+    def classify_batch(self, emails: List[EmailMessage]) -> List[TriageResult]:
+        """
+        Classify many emails with one LLM call per chunk of `batch_size`.
+        Results are returned in input order. Emails the heuristic is confident
+        about never reach the LLM. A chunk whose reply cannot be parsed (or
+        misses an email) falls back to per-email prompts, run concurrently
+        through the chain's batch().
+        """
+        results = [self._short_circuit(e) for e in emails]
+        it = iter([i for i, r in enumerate(results) if r is None])
+        while idx := list(islice(it, self.batch_size)):
+            for i, r in zip(idx, self._classify_chunk([emails[i] for i in idx])):
+                results[i] = r
+        return results
+
+    async def aclassify_batch(self, emails: List[EmailMessage]) -> List[TriageResult]:
+        """Async variant of classify_batch()."""
+        results = [self._short_circuit(e) for e in emails]
+        it = iter([i for i, r in enumerate(results) if r is None])
+        while idx := list(islice(it, self.batch_size)):
+            for i, r in zip(idx, await self._aclassify_chunk([emails[i] for i in idx])):
+                results[i] = r
+        return results
+
+    def _classify_chunk(self, emails: List[EmailMessage]) -> List[TriageResult]:
+        if self.llm:
+            try:
+                out = self._batch_chain.invoke(self._batch_inputs(emails))
+                return self._match_batch_output(emails, out)
+            except Exception:
+                pass
+
+            outputs = self._chain.batch(
+                [self._llm_inputs(e) for e in emails],
+                config={"max_concurrency": self.batch_max_concurrency},
+                return_exceptions=True,
+            )
+            return [self._batch_result(e, out) for e, out in zip(emails, outputs)]
+
+        return [self._heuristic(e) for e in emails]
+
+    async def _aclassify_chunk(self, emails: List[EmailMessage]) -> List[TriageResult]:
+        if self.llm:
+            try:
+                out = await self._batch_chain.ainvoke(self._batch_inputs(emails))
+                return self._match_batch_output(emails, out)
+            except Exception:
+                pass
+
+            outputs = await self._chain.abatch(
+                [self._llm_inputs(e) for e in emails],
+                config={"max_concurrency": self.batch_max_concurrency},
+                return_exceptions=True,
+            )
+            return [self._batch_result(e, out) for e, out in zip(emails, outputs)]
+
+        return [self._heuristic(e) for e in emails]
+
+    def _batch_inputs(self, emails: List[EmailMessage]) -> dict:
+        payload = [
+            {"id": e.email_id, "subject": e.subject, "body_truncated": e.body[: self.batch_body_chars]}
+            for e in emails
+        ]
+        return {"emails": json.dumps(payload, ensure_ascii=False)}
+
+    def _match_batch_output(self, emails: List[EmailMessage], out: list) -> List[TriageResult]:
+        # Raises (-> per-email fallback) if the model skipped or renamed an email
+        by_id = {item["email_id"]: TriageResult.model_validate(item) for item in out}
+        return [by_id[e.email_id] for e in emails]
+
+    def _batch_result(self, email: EmailMessage, out) -> TriageResult:
+        if not isinstance(out, Exception):
+            try:
+                return TriageResult.model_validate(out)
+            except Exception:
+                pass
+        return self._heuristic(email)
+
+    def _llm_inputs(self, email: EmailMessage) -> dict:
+        return {
+            "subject": email.subject,
+            "body": email.body,
+            "format_instructions": self._format_instructions,
+        }
+
+    def _short_circuit(self, email: EmailMessage) -> Optional[TriageResult]:
+        """Heuristic label when one side has a strong signal and the other none; else None."""
+        if not (self.llm and self.short_circuit):
+            return None
         text = f"{email.subject} {email.body}".lower()
+        spam = _STRONG_SPAM_RE.search(text)
 
-        # Strong spam signals
-        spam_signals = ["seo", "marketing", "partnership", "promotion", "ads", "advertising", "agency"]
-        if any(s in text for s in spam_signals):
+        if spam and not _CLAIM_RE.search(text):
             return TriageResult(label="NON_CLAIM", reason="Spam/marketing outreach signals detected")
 
-        # Broad claim signals (include wear/tear, travel damage, cracks, attachments)
-        claim_signals = [
-            "warranty", "claim", "replace", "replacement", "refund", "return",
-            "bought", "purchase", "purchased", "order", "invoice", "receipt",
-            "dryer", "hair dryer", "aerodry",
-            "stopped", "not working", "won’t", "won't", "doesn't", "no power",
-            "overheat", "overheating", "shuts off", "burning", "sparks",
-            "touch", "controls", "firmware",
-            "attachment", "nozzle", "diffuser", "doesn't fit", "fits securely",
-            "cracked", "broken", "dropped",
-            "travel", "flight", "suitcase"
-        ]
+        if not spam and _STRONG_CLAIM_RE.search(text):
+            return TriageResult(label="WARRANTY_CLAIM", reason="Warranty/purchase signals detected")
+
+        return None
+
+    def _heuristic(self, email: EmailMessage) -> TriageResult:
+        text = f"{email.subject} {email.body}".lower()
+
+        if _SPAM_RE.search(text):
+            return TriageResult(label="NON_CLAIM", reason="Spam/marketing outreach signals detected")
 
-        if any(k in text for k in claim_signals):
+        if _CLAIM_RE.search(text):
             return TriageResult(label="WARRANTY_CLAIM", reason="Product issue/purchase/damage signals detected")
 
         return TriageResult(label="NON_CLAIM", reason="No product issue/purchase/warranty indicators detected")
@@ -0,0 +1,54 @@
+# tests/test_policy_retriever.py
+from __future__ import annotations
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.tools.policy_retriever import PolicyRetriever, PolicyRetrieverConfig
+
+POLICIES_DIR = Path(__file__).resolve().parents[1] / "data" / "policies"
+
+
+class PolicyCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp)
+        self.policies_dir = tmp / "policies"
+        shutil.copytree(POLICIES_DIR, self.policies_dir)
+        self.config = PolicyRetrieverConfig(policies_dir=self.policies_dir, cache_path=tmp / "policy_cache.json")
+
+    def test_reuses_cache_while_files_unchanged(self) -> None:
+        first = PolicyRetriever(self.config)
+        self.assertTrue(self.config.cache_path.exists())
+
+        # Only a cache miss rebuilds and rewrites the cache file
+        with mock.patch.object(PolicyRetriever, "_write_cache", side_effect=AssertionError("cache miss")):
+            second = PolicyRetriever(self.config)
+        self.assertEqual(second.list_products(), first.list_products())
+
+    def test_rebuilds_when_policy_file_changes(self) -> None:
+        PolicyRetriever(self.config)
+
+        fp = self.policies_dir / "policy_aerodry_ecolite.json"
+        raw = json.loads(fp.read_text(encoding="utf-8"))
+        raw["product_name"] = "AeroDry EcoLite Mk2"
+        fp.write_text(json.dumps(raw), encoding="utf-8")
+
+        retriever = PolicyRetriever(self.config)
+        self.assertIn("AeroDry EcoLite Mk2", retriever.list_products())
+        self.assertNotIn("AeroDry EcoLite", retriever.list_products())
+        cached = json.loads(self.config.cache_path.read_text(encoding="utf-8"))
+        self.assertIn("AeroDry EcoLite Mk2", [p["product_name"] for p in cached["policies"]])
+
+    def test_rejects_cache_inside_policies_dir(self) -> None:
+        for cache_path in (self.policies_dir / "cache.json", self.policies_dir / "sub" / "cache.json"):
+            with self.assertRaises(ValueError):
+                PolicyRetriever(PolicyRetrieverConfig(policies_dir=self.policies_dir, cache_path=cache_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
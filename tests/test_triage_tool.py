@@ -0,0 +1,41 @@
+# tests/test_triage_tool.py
+from __future__ import annotations
+
+import json
+import unittest
+
+from langchain_core.language_models import FakeListChatModel
+
+from src.schemas import EmailMessage
+from src.tools.triage_tool import TriageTool
+
+LLM_REPLY = json.dumps({"label": "NON_CLAIM", "reason": "llm"})
+
+
+def _email(subject: str, body: str) -> EmailMessage:
+    return EmailMessage(email_id="e1", subject=subject, body=body)
+
+
+class TriageShortCircuitTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.llm = FakeListChatModel(responses=[LLM_REPLY, LLM_REPLY], cache=False)
+        self.tool = TriageTool(llm=self.llm)
+
+    def test_ambiguous_purchase_wording_reaches_llm(self) -> None:
+        email = _email(
+            "Grow your salon sales",
+            "Salons that bought our lead lists purchased twice as many dryers. Book a call today.",
+        )
+        result = self.tool.classify(email)
+        self.assertEqual(self.llm.i, 1)
+        self.assertEqual(result.reason, "llm")
+
+    def test_unambiguous_warranty_email_skips_llm(self) -> None:
+        email = _email("Warranty request", "My dryer stopped working, invoice attached.")
+        result = self.tool.classify(email)
+        self.assertEqual(self.llm.i, 0)
+        self.assertEqual(result.label, "WARRANTY_CLAIM")
+
+
+if __name__ == "__main__":
+    unittest.main()